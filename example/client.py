@@ -10,24 +10,43 @@ Prerequisites:
 """
 
 import asyncio
+import base64
+import importlib.util
+import random
+import sys
+import time
 import struct
-from typing import Optional, Tuple, Dict, Any
+import numpy as np
+import httpx
+import orjson
+from typing import Optional, Tuple, Dict, Any, AsyncIterator, Union, Callable, Awaitable, TypeVar
 from dataclasses import dataclass
 from solana.rpc.async_api import AsyncClient
-from solana.rpc.commitment import Confirmed, Finalized
+from solana.rpc.commitment import Commitment, Processed, Confirmed, Finalized
 from solana.rpc.types import TxOpts
+from solana.rpc.websocket_api import connect
 from solders.keypair import Keypair
 from solders.pubkey import Pubkey
 from solders.system_program import ID as SYS_PROGRAM_ID
 from solders.sysvar import RENT as SYSVAR_RENT_PUBKEY, CLOCK as SYSVAR_CLOCK_PUBKEY
-from solders.transaction import Transaction, VersionedTransaction
+from solders.transaction import VersionedTransaction
 from solders.message import Message, MessageV0
 from solders.instruction import Instruction, AccountMeta
+from solders.rpc.config import RpcAccountInfoConfig, RpcSendTransactionConfig
+from solders.rpc.requests import AccountSubscribe, SendVersionedTransaction
+from solders.rpc.responses import AccountNotification, SubscriptionResult
+from solders.account_decoder import UiAccountEncoding
+from solders.commitment_config import CommitmentLevel
 from spl.token.constants import TOKEN_PROGRAM_ID
 from spl.token.instructions import transfer, TransferParams
 from spl.token._layouts import ACCOUNT_LAYOUT
 import borsh_construct as borsh
 
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; liquidation scans fall back to numpy
+    njit = None
+
 # Load program ID dynamically from deployment file
 try:
     with open("program_id.txt", "r") as f:
@@ -38,6 +57,29 @@ except FileNotFoundError:
     program_id_loaded = False
 PDA_SEED = b"perps"
 PRECISION = 1_000_000_000  # 1e9 precision for prices
+MAX_MULTIPLE_ACCOUNTS = 100  # getMultipleAccounts key limit per request
+MAX_CONCURRENT_REQUESTS = 8  # In-flight RPC cap to stay under provider rate limits
+POSITION_PDA_CACHE_SIZE = 4096  # Position PDAs remembered per client
+LIQUIDATION_HEALTH = (15, 10)  # 1.5 collateral ratio as numerator/denominator
+RPC_TIMEOUT = 10  # Seconds, same as the solana-py default
+HEDGE_DELAY = 0.02  # Seconds before a read is also sent to the next fallback endpoint
+MARKET_STATE_MAX_AGE = 0.4  # Seconds (about one slot) a cached market state is served
+HOT_PATH_MAX_RETRIES = 3  # Node-side resends for transactions sent without preflight
+CONFIRM_TIMEOUT = 90  # Seconds; a blockhash expires after ~60s (150 blocks), then ~13s to finalize
+
+# Keep TLS sessions warm between monitor passes instead of reconnecting
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=60.0)
+# httpx needs the h2 package (httpx[http2]) to multiplex requests over HTTP/2
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+T = TypeVar("T")
+
+# solana-py commitments as solders levels, for hand-built request bodies
+_COMMITMENT_LEVELS = {
+    Processed: CommitmentLevel.Processed,
+    Confirmed: CommitmentLevel.Confirmed,
+    Finalized: CommitmentLevel.Finalized,
+}
 
 # Instruction tags
 INSTRUCTION_OPEN_POSITION = 0
@@ -45,8 +87,20 @@ INSTRUCTION_UPDATE_FUNDING = 1
 INSTRUCTION_LIQUIDATE = 2
 INSTRUCTION_CLOSE_POSITION = 3
 
+# Fixed little-endian account layouts ('<' disables alignment padding)
+_POSITION_STRUCT = struct.Struct('<32sqQqQ')  # owner, base_amount, collateral, last_funding_index, entry_price
+_MARKET_STRUCT = struct.Struct('<qqQBQQ')   # 41 bytes, matches the Borsh encoding
+_OPEN_STRUCT = struct.Struct('<BqQQ')       # tag, base_delta, collateral_delta, entry_price
+_POSITION_DTYPE = np.dtype([
+    ('owner', 'V32'),
+    ('base_amount', '<i8'),
+    ('collateral', '<u8'),
+    ('last_funding_index', '<i8'),
+    ('entry_price', '<u8'),
+])  # 64 bytes, for decoding many positions at once
+
 # Borsh schemas for data serialization/deserialization
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Position:
     owner: Pubkey
     base_amount: int  # i64
@@ -60,15 +114,11 @@ class Position:
         if len(data) < 64:
             raise ValueError("Invalid position data length")
         
-        owner = Pubkey(data[0:32])
-        base_amount = struct.unpack('<q', data[32:40])[0]  # i64
-        collateral = struct.unpack('<Q', data[40:48])[0]   # u64
-        last_funding_index = struct.unpack('<q', data[48:56])[0]  # i64
-        entry_price = struct.unpack('<Q', data[56:64])[0]  # u64
+        owner, base_amount, collateral, last_funding_index, entry_price = _POSITION_STRUCT.unpack_from(data, 0)
         
-        return cls(owner, base_amount, collateral, last_funding_index, entry_price)
+        return cls(Pubkey(owner), base_amount, collateral, last_funding_index, entry_price)
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MarketState:
     funding_index: int          # i64
     funding_rate_per_slot: int  # i64
@@ -83,110 +133,326 @@ class MarketState:
         if len(data) < 41:
             raise ValueError("Invalid market state data length")
         
-        funding_index = struct.unpack('<q', data[0:8])[0]        # i64
-        funding_rate_per_slot = struct.unpack('<q', data[8:16])[0]  # i64
-        open_interest = struct.unpack('<Q', data[16:24])[0]      # u64
-        bump = struct.unpack('<B', data[24:25])[0]               # u8
-        last_funding_slot = struct.unpack('<Q', data[25:33])[0]  # u64
-        mark_price = struct.unpack('<Q', data[33:41])[0]         # u64
-        
-        return cls(funding_index, funding_rate_per_slot, open_interest, 
-                  bump, last_funding_slot, mark_price)
+        return cls(*_MARKET_STRUCT.unpack_from(data, 0))
+
+def _decode_market_state(data: Optional[bytes]) -> Optional[MarketState]:
+    """Decode market state, or None for a missing, closed or emptied account"""
+    if data is None or len(data) < _MARKET_STRUCT.size:
+        return None
+    return MarketState.from_bytes(data)
+
+def _mul_div_precision(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Exact a * b // PRECISION on int64 arrays
+    
+    Both factors are split at PRECISION, so no partial product overflows
+    int64 unless the result itself does (the program's checked_mul limit).
+    """
+    precision = np.int64(PRECISION)
+    a_hi, a_lo = np.divmod(a, precision)
+    b_hi, b_lo = np.divmod(b, precision)
+    return a_hi * b_hi * precision + a_hi * b_lo + a_lo * b_hi + a_lo * b_lo // precision
+
+def _scan_liquidatable_numpy(
+    base_amount: np.ndarray,
+    collateral: np.ndarray,
+    mark_price: int,
+    threshold_num: int,
+    threshold_den: int
+) -> np.ndarray:
+    """Mask of positions below the threshold collateral ratio"""
+    position_value = _mul_div_precision(np.abs(base_amount), np.int64(mark_price))
+    return (position_value > 0) & (collateral * threshold_den < position_value * threshold_num)
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _scan_liquidatable_numba(base_amount, collateral, mark_price, threshold_num, threshold_den):
+        """Mask of positions below the threshold collateral ratio (compiled)"""
+        is_liquidatable = np.zeros(base_amount.shape[0], dtype=np.bool_)
+        mark_hi, mark_lo = mark_price // PRECISION, mark_price % PRECISION
+        for i in prange(base_amount.shape[0]):
+            # Same split multiply as _mul_div_precision, kept in int64
+            size = abs(base_amount[i])
+            size_hi, size_lo = size // PRECISION, size % PRECISION
+            position_value = (size_hi * mark_hi * PRECISION + size_hi * mark_lo
+                              + size_lo * mark_hi + size_lo * mark_lo // PRECISION)
+            is_liquidatable[i] = (position_value > 0
+                                  and collateral[i] * threshold_den < position_value * threshold_num)
+        return is_liquidatable
+
+def scan_liquidatable(base_amount: np.ndarray, collateral: np.ndarray, mark_price: int) -> np.ndarray:
+    """Mask of positions below the liquidation collateral ratio
+    
+    Compares collateral * den < value * num in integers instead of
+    dividing, using a parallel numba kernel when numba is installed.
+    """
+    threshold_num, threshold_den = LIQUIDATION_HEALTH
+    # int64 throughout; mixing in uint64 would promote to float
+    base_amount = np.ascontiguousarray(base_amount, dtype=np.int64)
+    collateral = np.ascontiguousarray(collateral, dtype=np.int64)
+    if njit is not None:
+        return _scan_liquidatable_numba(base_amount, collateral, mark_price, threshold_num, threshold_den)
+    return _scan_liquidatable_numpy(base_amount, collateral, mark_price, threshold_num, threshold_den)
+
+def _tx_opts(hot_path: bool) -> TxOpts:
+    """Send options; hot paths skip the preflight simulation"""
+    if hot_path:
+        return TxOpts(skip_preflight=True, preflight_commitment=Confirmed, max_retries=HOT_PATH_MAX_RETRIES)
+    return TxOpts(skip_preflight=False, preflight_commitment=Confirmed)
+
+class _PooledSession(httpx.AsyncClient):
+    """HTTP session that also closes the provider session it replaced"""
+    
+    def __init__(self, replaced: httpx.AsyncClient, **kwargs):
+        super().__init__(**kwargs)
+        self._replaced = replaced
+    
+    async def aclose(self):
+        await super().aclose()
+        await self._replaced.aclose()
+
+def create_rpc_client(
+    rpc_url: str,
+    limits: httpx.Limits = HTTP_LIMITS,
+    extra_headers: Optional[Dict[str, str]] = None,
+    proxy: Optional[str] = None
+) -> AsyncClient:
+    """Create an RPC client backed by a pooled HTTP/2 session
+    
+    Falls back to pooled HTTP/1.1 when h2 is not installed. The result
+    can be shared by several PerpetualsClient instances.
+    """
+    rpc_client = AsyncClient(rpc_url, commitment=Confirmed, timeout=RPC_TIMEOUT, extra_headers=extra_headers)
+    # solana-py does not expose transport options, so swap in a tuned session
+    rpc_client._provider.session = _PooledSession(
+        rpc_client._provider.session,
+        http2=HTTP2_AVAILABLE,
+        limits=limits,
+        timeout=RPC_TIMEOUT,
+        headers=extra_headers,
+        proxy=proxy
+    )
+    return rpc_client
 
 class PerpetualsClient:
     """Python client for interacting with the Simple Perpetuals program"""
     
-    def __init__(self, rpc_url: str, payer: Keypair, program_id: str):
-        self.client = AsyncClient(rpc_url, commitment=Confirmed)
+    def __init__(
+        self,
+        rpc_url: str,
+        payer: Keypair,
+        program_id: Union[str, Pubkey],
+        max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
+        rpc_client: Optional[AsyncClient] = None,
+        ws_url: Optional[str] = None,
+        fallback_rpc_urls: Optional[list[str]] = None
+    ):
+        # A shared rpc_client is owned (and closed) by the caller
+        self._owns_client = rpc_client is None
+        self.client = rpc_client or create_rpc_client(rpc_url)
+        # Reads hedge to these endpoints when the primary is slow
+        self._fallback_clients = [create_rpc_client(url) for url in fallback_rpc_urls or []]
+        self.rpc_url = rpc_url
+        # Solana RPC nodes serve pubsub on the same host
+        self.ws_url = ws_url or rpc_url.replace("https://", "wss://", 1).replace("http://", "ws://", 1)
         self.payer = payer
-        self.program_id = Pubkey.from_string(program_id)
+        self._payer_pubkey = payer.pubkey()
+        # Accept an already decoded Pubkey to skip the base58 decode
+        self.program_id = program_id if isinstance(program_id, Pubkey) else Pubkey.from_string(program_id)
+        self._request_semaphore = asyncio.Semaphore(max_concurrent_requests)
+        
+        # (monotonic fetch time, state) of the last market state read per commitment
+        self._market_state_cache: Dict[Commitment, Tuple[float, MarketState]] = {}
+        self._market_state_lock = asyncio.Lock()
+        
+        # PDA bump searches hash up to 256 candidates, so derive constant ones once
+        self._vault_pda = Pubkey.find_program_address([PDA_SEED], self.program_id)
+        self._market_state_pda = Pubkey.find_program_address([b"market"], self.program_id)
+        self._position_pdas: Dict[Pubkey, Tuple[Pubkey, int]] = {}
+        
+        # Account metas shared by every instruction; only token accounts and
+        # other users' positions vary per call
+        self._payer_meta = AccountMeta(pubkey=self._payer_pubkey, is_signer=True, is_writable=False)
+        self._token_program_meta = AccountMeta(pubkey=TOKEN_PROGRAM_ID, is_signer=False, is_writable=False)
+        self._vault_meta = AccountMeta(pubkey=self._vault_pda[0], is_signer=False, is_writable=True)
+        self._payer_position_meta = AccountMeta(
+            pubkey=self.get_position_address(self._payer_pubkey)[0], is_signer=False, is_writable=True
+        )
+        self._market_state_meta = AccountMeta(pubkey=self._market_state_pda[0], is_signer=False, is_writable=True)
+        self._rent_meta = AccountMeta(pubkey=SYSVAR_RENT_PUBKEY, is_signer=False, is_writable=False)
+        self._clock_meta = AccountMeta(pubkey=SYSVAR_CLOCK_PUBKEY, is_signer=False, is_writable=False)
+        self._system_program_meta = AccountMeta(pubkey=SYS_PROGRAM_ID, is_signer=False, is_writable=False)
         
+        # update_funding only touches constant accounts
+        self._update_funding_accounts = [self._market_state_meta, self._clock_meta]
+        
+    async def warm_up(self) -> bool:
+        """Open the RPC connection before the first real request
+        
+        Pays the TCP/TLS handshake with a cheap getVersion call so later
+        reads reuse the pooled connection. Returns False if unreachable.
+        """
+        try:
+            await self.client.get_version()
+            return True
+        except Exception as e:
+            return False
+    
     async def close(self):
         """Close the RPC client"""
-        await self.client.close()
+        if self._owns_client:
+            await self.client.close()
+        for fallback_client in self._fallback_clients:
+            await fallback_client.close()
+    
+    async def _hedged_read(self, read: Callable[[AsyncClient], Awaitable[T]]) -> T:
+        """Run a read on the primary endpoint, hedging to fallbacks if it is slow
+        
+        Each fallback is started after a jittered HEDGE_DELAY without a
+        result (or right away if the previous attempt failed). The first
+        successful result wins and the other requests are cancelled.
+        """
+        if not self._fallback_clients:
+            return await read(self.client)
+        
+        clients = [self.client, *self._fallback_clients]
+        pending: set[asyncio.Task] = set()
+        error: Optional[BaseException] = None
+        try:
+            while clients or pending:
+                if clients:
+                    pending.add(asyncio.create_task(read(clients.pop(0))))
+                timeout = HEDGE_DELAY * random.uniform(1.0, 1.5) if clients else None
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
     
     def get_program_authority(self) -> Tuple[Pubkey, int]:
         """Get PDA for the program authority (vault)"""
-        return Pubkey.find_program_address([PDA_SEED], self.program_id)
+        return self._vault_pda
     
     def get_position_address(self, user: Pubkey) -> Tuple[Pubkey, int]:
         """Get PDA for a user's position account"""
-        return Pubkey.find_program_address([b"position", bytes(user)], self.program_id)
+        position_pda = self._position_pdas.get(user)
+        if position_pda is None:
+            position_pda = Pubkey.find_program_address([b"position", bytes(user)], self.program_id)
+            self._cache_position_address(user, position_pda)
+        return position_pda
+    
+    def get_position_addresses_bulk(self, users: list[Pubkey]) -> list[Tuple[Pubkey, int]]:
+        """Get PDAs for many users' position accounts
+        
+        Derived in-process: at roughly 11 µs per PDA, serial derivation is
+        cheaper than starting worker processes for any realistic user set.
+        """
+        return [self.get_position_address(user) for user in users]
+    
+    def _cache_position_address(self, user: Pubkey, position_pda: Tuple[Pubkey, int]):
+        """Remember a derived position PDA"""
+        if len(self._position_pdas) >= POSITION_PDA_CACHE_SIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            del self._position_pdas[next(iter(self._position_pdas))]
+        self._position_pdas[user] = position_pda
     
     def get_market_state_address(self) -> Tuple[Pubkey, int]:
         """Get PDA for the market state account"""
-        return Pubkey.find_program_address([b"market"], self.program_id)
+        return self._market_state_pda
     
-    async def open_position(
-        self,
-        base_delta: int,        # Position size change (signed)
-        collateral_delta: int,  # Additional collateral
-        entry_price: int,       # Entry price
-        user_token_account: Pubkey
-    ) -> str:
-        """Open or modify a position"""
-        
-        vault_pda, _ = self.get_program_authority()
-        position_pda, _ = self.get_position_address(self.payer.pubkey())
-        market_state_pda, _ = self.get_market_state_address()
-        
-        # Create instruction data
-        instruction_data = bytearray(25)
-        instruction_data[0] = INSTRUCTION_OPEN_POSITION
-        instruction_data[1:9] = struct.pack('<q', base_delta)      # i64
-        instruction_data[9:17] = struct.pack('<Q', collateral_delta)  # u64
-        instruction_data[17:25] = struct.pack('<Q', entry_price)   # u64
-        
-        accounts = [
-            AccountMeta(pubkey=self.payer.pubkey(), is_signer=True, is_writable=False),
-            AccountMeta(pubkey=TOKEN_PROGRAM_ID, is_signer=False, is_writable=False),
-            AccountMeta(pubkey=user_token_account, is_signer=False, is_writable=True),
-            AccountMeta(pubkey=vault_pda, is_signer=False, is_writable=True),
-            AccountMeta(pubkey=position_pda, is_signer=False, is_writable=True),
-            AccountMeta(pubkey=market_state_pda, is_signer=False, is_writable=True),
-            AccountMeta(pubkey=SYSVAR_RENT_PUBKEY, is_signer=False, is_writable=False),
-            AccountMeta(pubkey=SYSVAR_CLOCK_PUBKEY, is_signer=False, is_writable=False),
-            AccountMeta(pubkey=SYS_PROGRAM_ID, is_signer=False, is_writable=False),
-        ]
+    def derive_pdas(self, seed_sets: list[Tuple[bytes, ...]]) -> list[Tuple[Pubkey, int]]:
+        """Get PDAs for several seed sets in one call
+        
+        Seeds for the vault, market state and position accounts are served
+        from the client's caches; any other seeds are derived directly.
+        """
+        derived = []
+        for seeds in seed_sets:
+            if seeds == (PDA_SEED,):
+                derived.append(self._vault_pda)
+            elif seeds == (b"market",):
+                derived.append(self._market_state_pda)
+            elif len(seeds) == 2 and seeds[0] == b"position" and len(seeds[1]) == 32:
+                derived.append(self.get_position_address(Pubkey(seeds[1])))
+            else:
+                derived.append(Pubkey.find_program_address(list(seeds), self.program_id))
+        return derived
+    
+    async def _send_instruction(self, instruction: Instruction, opts: TxOpts, confirm: bool = False) -> str:
+        """Compile, sign and send a single-instruction transaction
         
-        instruction = Instruction(
-            program_id=self.program_id,
-            data=bytes(instruction_data),
-            accounts=accounts
-        )
+        With confirm=True, waits for a pushed finalization notification
+        instead of polling signature statuses, and raises TimeoutError if
+        none arrives within CONFIRM_TIMEOUT (e.g. a dropped transaction).
+        """
         
         # Get latest blockhash
         blockhash_resp = await self.client.get_latest_blockhash()
         recent_blockhash = blockhash_resp.value.blockhash
         
-        # Create message
         message = MessageV0.try_compile(
-            self.payer.pubkey(),
+            self._payer_pubkey,
             [instruction],
             [],
             recent_blockhash
         )
-        
-        # Create transaction
         transaction = VersionedTransaction(message, [self.payer])
         
-        response = await self.client.send_transaction(
-            transaction, 
-            opts=TxOpts(skip_preflight=False, preflight_commitment=Confirmed)
-        )
-        
-        return response['result']
+        if not confirm:
+            # Send the pre-serialized wire bytes directly
+            response = await self.client.send_raw_transaction(bytes(transaction), opts=opts)
+            return str(response.value)
+        
+        # Subscribe before sending so the notification cannot be missed;
+        # signature subscriptions end after their first notification
+        async with connect(self.ws_url) as websocket:
+            await websocket.signature_subscribe(transaction.signatures[0], commitment=Finalized)
+            subscription_id = (await websocket.recv())[0].result
+            response = await self.client.send_raw_transaction(bytes(transaction), opts=opts)
+            try:
+                notification = (await asyncio.wait_for(websocket.recv(), CONFIRM_TIMEOUT))[0]
+            except asyncio.TimeoutError:
+                await websocket.signature_unsubscribe(subscription_id)
+                raise TimeoutError(
+                    f"Transaction {response.value} not finalized within {CONFIRM_TIMEOUT}s; "
+                    "it was likely dropped or its blockhash expired"
+                ) from None
+        
+        if notification.result.value.err is not None:
+            raise RuntimeError(f"Transaction {response.value} failed: {notification.result.value.err}")
+        
+        return str(response.value)
     
-    async def update_funding(self) -> str:
-        """Update funding rates (should be called periodically)"""
-        
-        market_state_pda, _ = self.get_market_state_address()
+    async def open_position(
+        self,
+        base_delta: int,        # Position size change (signed)
+        collateral_delta: int,  # Additional collateral
+        entry_price: int,       # Entry price
+        user_token_account: Pubkey,
+        hot_path: bool = False
+    ) -> str:
+        """Open or modify a position"""
         
-        instruction_data = bytes([INSTRUCTION_UPDATE_FUNDING])
+        # Create instruction data
+        instruction_data = _OPEN_STRUCT.pack(
+            INSTRUCTION_OPEN_POSITION, base_delta, collateral_delta, entry_price
+        )
         
         accounts = [
-            AccountMeta(pubkey=market_state_pda, is_signer=False, is_writable=True),
-            AccountMeta(pubkey=SYSVAR_CLOCK_PUBKEY, is_signer=False, is_writable=False),
+            self._payer_meta,
+            self._token_program_meta,
+            AccountMeta(pubkey=user_token_account, is_signer=False, is_writable=True),
+            self._vault_meta,
+            self._payer_position_meta,
+            self._market_state_meta,
+            self._rent_meta,
+            self._clock_meta,
+            self._system_program_meta,
         ]
         
         instruction = Instruction(
@@ -195,71 +461,134 @@ class PerpetualsClient:
             accounts=accounts
         )
         
-        transaction = Transaction().add(instruction)
+        return await self._send_instruction(instruction, _tx_opts(hot_path))
+    
+    async def update_funding(self, hot_path: bool = False) -> str:
+        """Update funding rates (should be called periodically)"""
         
-        response = await self.client.send_transaction(
-            transaction,
-            self.payer,
-            opts=TxOpts(skip_preflight=False, preflight_commitment=Confirmed)
+        instruction = Instruction(
+            program_id=self.program_id,
+            data=bytes([INSTRUCTION_UPDATE_FUNDING]),
+            accounts=self._update_funding_accounts
         )
         
-        return response['result']
+        return await self._send_instruction(instruction, _tx_opts(hot_path))
     
-    async def liquidate(
+    def _liquidate_instruction(
         self,
         position_owner: Pubkey,
         liquidator_token_account: Pubkey
-    ) -> str:
-        """Liquidate an undercollateralized position"""
+    ) -> Instruction:
+        """Build the liquidate instruction for a position"""
         
-        vault_pda, _ = self.get_program_authority()
         position_pda, _ = self.get_position_address(position_owner)
-        market_state_pda, _ = self.get_market_state_address()
         
         instruction_data = bytes([INSTRUCTION_LIQUIDATE])
         
         accounts = [
-            AccountMeta(pubkey=self.payer.pubkey(), is_signer=True, is_writable=False),
-            AccountMeta(pubkey=TOKEN_PROGRAM_ID, is_signer=False, is_writable=False),
+            self._payer_meta,
+            self._token_program_meta,
             AccountMeta(pubkey=liquidator_token_account, is_signer=False, is_writable=True),
-            AccountMeta(pubkey=vault_pda, is_signer=False, is_writable=True),
+            self._vault_meta,
             AccountMeta(pubkey=position_pda, is_signer=False, is_writable=True),
-            AccountMeta(pubkey=market_state_pda, is_signer=False, is_writable=True),
-            AccountMeta(pubkey=SYSVAR_CLOCK_PUBKEY, is_signer=False, is_writable=False),
+            self._market_state_meta,
+            self._clock_meta,
         ]
         
-        instruction = Instruction(
+        return Instruction(
             program_id=self.program_id,
             data=instruction_data,
             accounts=accounts
         )
+    
+    async def liquidate(
+        self,
+        position_owner: Pubkey,
+        liquidator_token_account: Pubkey,
+        confirm: bool = False,
+        hot_path: bool = True
+    ) -> str:
+        """Liquidate an undercollateralized position
+        
+        Skips preflight by default, since liquidations race other liquidators.
+        """
+        
+        instruction = self._liquidate_instruction(position_owner, liquidator_token_account)
         
-        transaction = Transaction().add(instruction)
+        return await self._send_instruction(instruction, _tx_opts(hot_path), confirm)
+    
+    async def liquidate_many(
+        self,
+        targets: list[Tuple[Pubkey, Pubkey]],
+        hot_path: bool = True
+    ) -> list[Tuple[Optional[str], Optional[Dict[str, Any]]]]:
+        """Liquidate several positions with one JSON-RPC batch request
+        
+        targets are (position_owner, liquidator_token_account) pairs. Returns
+        a (signature, error) pair per target; error is the node's JSON-RPC
+        error object when it rejected that transaction.
+        """
+        if not targets:
+            return []
+        
+        blockhash_resp = await self.client.get_latest_blockhash()
+        recent_blockhash = blockhash_resp.value.blockhash
         
-        response = await self.client.send_transaction(
-            transaction,
-            self.payer,
-            opts=TxOpts(skip_preflight=False, preflight_commitment=Confirmed)
+        opts = _tx_opts(hot_path)
+        send_config = RpcSendTransactionConfig(
+            skip_preflight=opts.skip_preflight,
+            preflight_commitment=_COMMITMENT_LEVELS[opts.preflight_commitment],
+            max_retries=opts.max_retries
         )
         
-        return response['result']
+        batch = []
+        for request_id, (position_owner, liquidator_token_account) in enumerate(targets):
+            message = MessageV0.try_compile(
+                self._payer_pubkey,
+                [self._liquidate_instruction(position_owner, liquidator_token_account)],
+                [],
+                recent_blockhash
+            )
+            transaction = VersionedTransaction(message, [self.payer])
+            batch.append(SendVersionedTransaction(transaction, send_config, request_id))
+        
+        # Unparsed, so per-entry errors and a rejected batch reach the caller as sent
+        async with self._request_semaphore:
+            raw = await self.client._provider.make_batch_request_unparsed(tuple(batch))
+        
+        # A rejected batch (e.g. rate limited) is a single error object, not a list
+        results = orjson.loads(raw)
+        if not isinstance(results, list):
+            error = results.get("error", results) if isinstance(results, dict) else results
+            raise RuntimeError(f"Batch request rejected: {error}")
+        
+        # Batch responses may arrive in any order; match them back by id
+        outcomes: list[Tuple[Optional[str], Optional[Dict[str, Any]]]] = [(None, None)] * len(targets)
+        for result in results:
+            request_id = result.get("id")
+            # Entries without a known id (e.g. per-entry parse errors) cannot be matched
+            if isinstance(request_id, int) and 0 <= request_id < len(targets):
+                outcomes[request_id] = (result.get("result"), result.get("error"))
+        
+        return outcomes
     
-    async def close_position(self, user_token_account: Pubkey) -> str:
+    async def close_position(
+        self,
+        user_token_account: Pubkey,
+        confirm: bool = False,
+        hot_path: bool = False
+    ) -> str:
         """Close a position voluntarily"""
         
-        vault_pda, _ = self.get_program_authority()
-        position_pda, _ = self.get_position_address(self.payer.pubkey())
-        market_state_pda, _ = self.get_market_state_address()
-        
         instruction_data = bytes([INSTRUCTION_CLOSE_POSITION])
         
         accounts = [
-            AccountMeta(pubkey=self.payer.pubkey(), is_signer=True, is_writable=False),
-            AccountMeta(pubkey=TOKEN_PROGRAM_ID, is_signer=False, is_writable=False),
+            self._payer_meta,
+            self._token_program_meta,
             AccountMeta(pubkey=user_token_account, is_signer=False, is_writable=True),
-            AccountMeta(pubkey=vault_pda, is_signer=False, is_writable=True),
-            AccountMeta(pubkey=position_pda, is_signer=False, is_writable=True),
-            AccountMeta(pubkey=market_state_pda, is_signer=False, is_writable=True),
+            self._vault_meta,
+            self._payer_position_meta,
+            self._market_state_meta,
         ]
         
         instruction = Instruction(
@@ -268,23 +597,17 @@ class PerpetualsClient:
             accounts=accounts
         )
         
-        transaction = Transaction().add(instruction)
-        
-        response = await self.client.send_transaction(
-            transaction,
-            self.payer,
-            opts=TxOpts(skip_preflight=False, preflight_commitment=Confirmed)
-        )
-        
-        return response['result']
+        return await self._send_instruction(instruction, _tx_opts(hot_path), confirm)
     
-    async def get_position(self, user: Pubkey) -> Optional[Position]:
+    async def get_position(self, user: Pubkey, commitment: Commitment = Confirmed) -> Optional[Position]:
         """Get position data for a user"""
         
         position_pda, _ = self.get_position_address(user)
         
         try:
-            response = await self.client.get_account_info(position_pda, commitment=Confirmed)
+            response = await self._hedged_read(
+                lambda rpc_client: rpc_client.get_account_info(position_pda, commitment=commitment)
+            )
             if response.value is None:
                 return None
             
@@ -294,13 +617,110 @@ class PerpetualsClient:
         except Exception as e:
             return None
     
-    async def get_market_state(self) -> Optional[MarketState]:
-        """Get market state"""
+    async def _get_account_data_chunk(
+        self,
+        addresses: list[Pubkey],
+        commitment: Commitment
+    ) -> list[Optional[bytes]]:
+        """Fetch raw data for up to MAX_MULTIPLE_ACCOUNTS accounts"""
+        async with self._request_semaphore:
+            response = await self.client.get_multiple_accounts(
+                addresses, commitment=commitment, encoding="base64"
+            )
+        return [account.data if account is not None else None for account in response.value]
+    
+    async def get_accounts_bulk(
+        self,
+        addresses: list[Pubkey],
+        commitment: Commitment = Confirmed
+    ) -> list[Optional[bytes]]:
+        """Get raw data for many accounts using getMultipleAccounts
+        
+        Chunks are requested concurrently rather than as one JSON-RPC batch,
+        since many RPC providers bill or throttle batches per inner request.
+        """
+        chunks = await asyncio.gather(*(
+            self._get_account_data_chunk(addresses[start:start + MAX_MULTIPLE_ACCOUNTS], commitment)
+            for start in range(0, len(addresses), MAX_MULTIPLE_ACCOUNTS)
+        ))
+        return [data for chunk in chunks for data in chunk]
+    
+    async def get_position_accounts(
+        self,
+        users: list[Pubkey],
+        commitment: Commitment = Confirmed
+    ) -> Tuple[Optional[MarketState], list[Optional[bytes]]]:
+        """Get market state and raw position account data in one batched read"""
+        
+        market_state_pda, _ = self.get_market_state_address()
+        position_pdas = [position_pda for position_pda, _ in self.get_position_addresses_bulk(users)]
+        
+        try:
+            account_data = await self.get_accounts_bulk([market_state_pda, *position_pdas], commitment)
+        except Exception as e:
+            return None, [None] * len(users)
+        
+        market_data, position_data = account_data[0], account_data[1:]
+        market_state = _decode_market_state(market_data)
+        if market_state is not None:
+            self._market_state_cache[commitment] = (time.monotonic(), market_state)
+        
+        return market_state, position_data
+    
+    async def get_market_state_and_positions(
+        self,
+        users: list[Pubkey],
+        commitment: Commitment = Confirmed
+    ) -> Tuple[Optional[MarketState], list[Optional[Position]]]:
+        """Get market state and positions for many users in one batched read"""
+        
+        market_state, position_data = await self.get_position_accounts(users, commitment)
+        positions = [
+            Position.from_bytes(data) if data is not None else None
+            for data in position_data
+        ]
+        
+        return market_state, positions
+    
+    async def get_positions(
+        self,
+        users: list[Pubkey],
+        commitment: Commitment = Confirmed
+    ) -> list[Optional[Position]]:
+        """Get position data for many users"""
+        _, positions = await self.get_market_state_and_positions(users, commitment)
+        return positions
+    
+    async def get_market_state(
+        self,
+        max_age: float = MARKET_STATE_MAX_AGE,
+        commitment: Commitment = Confirmed
+    ) -> Optional[MarketState]:
+        """Get market state
+        
+        A state read at the same commitment within the last max_age seconds
+        is served from memory; pass max_age=0 to always fetch. Concurrent
+        callers share one fetch.
+        """
+        async with self._market_state_lock:
+            cached = self._market_state_cache.get(commitment)
+            if cached is not None and time.monotonic() - cached[0] < max_age:
+                return cached[1]
+            
+            market_state = await self._fetch_market_state(commitment)
+            if market_state is not None:
+                self._market_state_cache[commitment] = (time.monotonic(), market_state)
+            return market_state
+    
+    async def _fetch_market_state(self, commitment: Commitment) -> Optional[MarketState]:
+        """Read market state from the RPC node"""
         
         market_state_pda, _ = self.get_market_state_address()
         
         try:
-            response = await self.client.get_account_info(market_state_pda, commitment=Confirmed)
+            response = await self._hedged_read(
+                lambda rpc_client: rpc_client.get_account_info(market_state_pda, commitment=commitment)
+            )
             if response.value is None:
                 return None
             
@@ -310,7 +730,8 @@ class PerpetualsClient:
         except Exception as e:
             return None
     
-    async def calculate_position_health(self, position: Position, mark_price: int) -> float:
+    @staticmethod
+    def calculate_position_health(position: Position, mark_price: int) -> float:
         """Calculate position health (collateral ratio)"""
         if position.base_amount == 0:
             return float('inf')  # No position = perfect health
@@ -321,7 +742,8 @@ class PerpetualsClient:
         
         return position.collateral / position_value
     
-    async def calculate_unrealized_pnl(self, position: Position, mark_price: int) -> int:
+    @staticmethod
+    def calculate_unrealized_pnl(position: Position, mark_price: int) -> int:
         """Calculate unrealized PnL for a position"""
         if position.base_amount == 0:
             return 0
@@ -336,6 +758,28 @@ class PerpetualsClient:
             pnl = (position.entry_price - mark_price) * position_size // PRECISION
         
         return pnl
+    
+    @staticmethod
+    def calculate_health_batch(
+        base_amount: np.ndarray,
+        collateral: np.ndarray,
+        mark_price: int
+    ) -> np.ndarray:
+        """Calculate position health for many positions at once"""
+        position_value = _mul_div_precision(np.abs(base_amount), np.int64(mark_price))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(position_value > 0, collateral / position_value, np.inf)
+    
+    @staticmethod
+    def calculate_pnl_batch(
+        base_amount: np.ndarray,
+        entry_price: np.ndarray,
+        mark_price: int
+    ) -> np.ndarray:
+        """Calculate unrealized PnL for many positions at once"""
+        # Sign of the position folds the long/short branches into one expression
+        price_change = np.sign(base_amount) * (np.int64(mark_price) - entry_price.astype(np.int64))
+        return _mul_div_precision(price_change, np.abs(base_amount))
 
 # Utility functions
 def price_to_program(price: float) -> int:
@@ -354,6 +798,23 @@ def size_from_program(program_size: int) -> float:
     """Convert program size to human-readable format"""
     return program_size / PRECISION
 
+# Vectorized variants; truncate like int() so results match the scalar versions
+def price_to_program_vec(prices: np.ndarray) -> np.ndarray:
+    """Convert human-readable prices to program format"""
+    return (np.asarray(prices, dtype=np.float64) * PRECISION).astype(np.int64)
+
+def price_from_program_vec(program_prices: np.ndarray) -> np.ndarray:
+    """Convert program prices to human-readable format"""
+    return np.asarray(program_prices, dtype=np.int64) / PRECISION
+
+def size_to_program_vec(sizes: np.ndarray) -> np.ndarray:
+    """Convert human-readable sizes to program format"""
+    return (np.asarray(sizes, dtype=np.float64) * PRECISION).astype(np.int64)
+
+def size_from_program_vec(program_sizes: np.ndarray) -> np.ndarray:
+    """Convert program sizes to human-readable format"""
+    return np.asarray(program_sizes, dtype=np.int64) / PRECISION
+
 async def example_usage():
     """Example usage of the Perpetuals client"""
     
@@ -362,47 +823,61 @@ async def example_usage():
     
     # Generate a keypair (in practice, load from file)
     payer = Keypair()
+    payer_pubkey = payer.pubkey()
     
-    # Initialize client
-    client = PerpetualsClient(rpc_url, payer, PROGRAM_ID_STR)
+    # Initialize client (decode the program ID once)
+    client = PerpetualsClient(rpc_url, payer, Pubkey.from_string(PROGRAM_ID_STR))
     
     try:
-        print(f"💰 Wallet: {payer.pubkey()}")
+        # Open the HTTPS connection up front so the reads below reuse it
+        await client.warm_up()
+        
+        print(f"💰 Wallet: {payer_pubkey}")
         
         # Test PDA generation (works without deployed program)
-        vault_pda, vault_bump = client.get_program_authority()
-        position_pda, pos_bump = client.get_position_address(payer.pubkey())
-        market_pda, market_bump = client.get_market_state_address()
+        (vault_pda, vault_bump), (position_pda, pos_bump), (market_pda, market_bump) = client.derive_pdas([
+            (PDA_SEED,),
+            (b"position", bytes(payer_pubkey)),
+            (b"market",),
+        ])
         
         print(f"🏦 Vault PDA: {vault_pda} (bump: {vault_bump})")
         print(f"👤 Position PDA: {position_pda} (bump: {pos_bump})")
         print(f"📊 Market PDA: {market_pda} (bump: {market_bump})")
         
-        # Test price conversions
-        test_price = 100.50
-        program_price = price_to_program(test_price)
-        converted_back = price_from_program(program_price)
-        print(f"💰 Price conversion test: ${test_price} → {program_price} → ${converted_back}")
+        # Test price and size conversions (one vectorized call per direction)
+        prices = np.array([0.01, 1.0, 100.50, 50_000.0])
+        program_prices = price_to_program_vec(prices)
+        prices_back = price_from_program_vec(program_prices)
+        sizes = np.array([0.001, 1.0, -2.5])
+        program_sizes = size_to_program_vec(sizes)
+        sizes_back = size_from_program_vec(program_sizes)
+        
+        # Assemble both tables from prebuilt row templates and write them at once
+        price_row = "   ${:>10.2f} → {:>16} → ${:>10.2f}".format
+        size_row = "   {:>8.3f} → {:>14} → {:>8.3f}".format
+        lines = ["💰 Price conversion tests:"]
+        lines += [price_row(*row) for row in zip(prices, program_prices, prices_back)]
+        lines.append("📏 Size conversion tests:")
+        lines += [size_row(*row) for row in zip(sizes, program_sizes, sizes_back)]
+        sys.stdout.write("\n".join(lines) + "\n")
+        
+        # Try to read market state and this wallet's position (silently)
+        # with a single getMultipleAccounts request; processed data is
+        # recent enough for a read-only check
+        market_state, (position,) = await client.get_market_state_and_positions(
+            [payer_pubkey], commitment=Processed
+        )
         
-        # Try to read market state from deployed program (silently)
-        try:
-            market_state = await client.get_market_state()
-            if market_state:
-                pass  # Successfully read market state, but don't print
-            else:
-                pass  # Market state not found, but don't print
-        except Exception:
-            pass  # Could not read market state, but don't print
+        if market_state:
+            pass  # Successfully read market state, but don't print
+        else:
+            pass  # Market state not found or unreadable, but don't print
         
-        # Try to read position for this wallet (silently)
-        try:
-            position = await client.get_position(payer.pubkey())
-            if position:
-                pass  # Position found, but don't print
-            else:
-                pass  # No position found, but don't print
-        except Exception:
-            pass  # Could not read position, but don't print
+        if position:
+            pass  # Position found, but don't print
+        else:
+            pass  # No position found or unreadable, but don't print
         
     except Exception as e:
         print(f"❌ Example error: {e}")
@@ -417,38 +892,116 @@ class PositionMonitor:
     
     async def monitor_liquidations(self, user_addresses: list[Pubkey]) -> list[Pubkey]:
         """Monitor positions for liquidation opportunities"""
-        liquidatable = []
-        
-        market_state = await self.client.get_market_state()
+        market_state, position_data = await self.client.get_position_accounts(user_addresses)
         if not market_state:
-            return liquidatable
+            return []
         
-        for user in user_addresses:
-            position = await self.client.get_position(user)
-            if not position or position.base_amount == 0:
-                continue
+        return self._find_liquidatable(market_state, user_addresses, position_data)
+    
+    async def watch_liquidations(self, user_addresses: list[Pubkey]) -> AsyncIterator[list[Pubkey]]:
+        """Yield liquidation opportunities whenever a watched account changes
+        
+        Subscribes to the market state and each position account, so only
+        pushed updates are processed instead of re-polling every account.
+        """
+        market_state_pda, _ = self.client.get_market_state_address()
+        position_pdas = [position_pda for position_pda, _ in self.client.get_position_addresses_bulk(user_addresses)]
+        position_index = {position_pda: i for i, position_pda in enumerate(position_pdas)}
+        
+        async with connect(self.client.ws_url) as websocket:
+            # Send every subscribe request in one batch instead of one round trip each
+            config = RpcAccountInfoConfig(encoding=UiAccountEncoding.Base64, commitment=CommitmentLevel.Confirmed)
+            requested: Dict[int, Pubkey] = {
+                websocket.increment_counter_and_get_id(): address
+                for address in [market_state_pda, *position_pdas]
+            }
+            await websocket.send_data([
+                AccountSubscribe(address, config, request_id) for request_id, address in requested.items()
+            ])
+            
+            # Acks can interleave with notifications for live subscriptions, so
+            # match them by request id; notifications seen meanwhile are
+            # superseded by the snapshot below
+            subscriptions: Dict[int, Pubkey] = {}
+            while len(subscriptions) < len(requested):
+                for message in await websocket.recv():
+                    if isinstance(message, SubscriptionResult) and message.id in requested:
+                        subscriptions[message.result] = requested[message.id]
+            
+            # Snapshot once every subscription is live, so no change falls between them
+            account_data = await self.client.get_accounts_bulk([market_state_pda, *position_pdas])
+            market_data, position_data = account_data[0], account_data[1:]
+            market_state = _decode_market_state(market_data)
             
-            health = await self.client.calculate_position_health(position, market_state.mark_price)
+            if market_state:
+                yield self._find_liquidatable(market_state, user_addresses, position_data)
             
-            # Check if below 150% collateral ratio (1.5)
-            if health < 1.5:
-                liquidatable.append(user)
-                print(f"🚨 Liquidation opportunity: {user} (health: {health:.3f})")
+            async for messages in websocket:
+                for message in messages:
+                    if not isinstance(message, AccountNotification):
+                        continue
+                    address = subscriptions.get(message.subscription)
+                    if address is None:
+                        continue
+                    
+                    account_data = message.result.value.data
+                    if address == market_state_pda:
+                        market_state = _decode_market_state(account_data)
+                    else:
+                        position_data[position_index[address]] = account_data
+                
+                if market_state:
+                    yield self._find_liquidatable(market_state, user_addresses, position_data)
+    
+    def _find_liquidatable(
+        self,
+        market_state: MarketState,
+        user_addresses: list[Pubkey],
+        position_data: list[Optional[bytes]]
+    ) -> list[Pubkey]:
+        """Find liquidatable users from raw position account data"""
+        liquidatable = []
+        
+        # Decode every existing position in one pass instead of per-account unpacking
+        present = [
+            i for i, data in enumerate(position_data)
+            if data is not None and len(data) >= _POSITION_DTYPE.itemsize
+        ]
+        if not present:
+            return liquidatable
+        
+        positions = np.frombuffer(
+            b"".join(position_data[i][:_POSITION_DTYPE.itemsize] for i in present),
+            dtype=_POSITION_DTYPE
+        )
+        # Check if below 150% collateral ratio (1.5); health is only computed for hits
+        rows = np.flatnonzero(
+            scan_liquidatable(positions['base_amount'], positions['collateral'], market_state.mark_price)
+        )
+        health = self.client.calculate_health_batch(
+            positions['base_amount'][rows], positions['collateral'][rows], market_state.mark_price
+        )
+        for row, row_health in zip(rows, health):
+            user = user_addresses[present[row]]
+            liquidatable.append(user)
+            print(f"🚨 Liquidation opportunity: {user} (health: {row_health:.3f})")
         
         return liquidatable
     
     async def get_position_summary(self, user: Pubkey) -> Dict[str, Any]:
         """Get comprehensive position summary"""
-        position = await self.client.get_position(user)
+        position, market_state = await asyncio.gather(
+            self.client.get_position(user),
+            self.client.get_market_state()
+        )
         if not position:
             return {"exists": False}
         
-        market_state = await self.client.get_market_state()
         if not market_state:
             return {"exists": True, "error": "Market state not available"}
         
-        health = await self.client.calculate_position_health(position, market_state.mark_price)
-        pnl = await self.client.calculate_unrealized_pnl(position, market_state.mark_price)
+        health = self.client.calculate_position_health(position, market_state.mark_price)
+        pnl = self.client.calculate_unrealized_pnl(position, market_state.mark_price)
         
         return {
             "exists": True,
@@ -467,6 +1020,9 @@ class PositionMonitor:
 
 import pytest
 import pytest_asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from solders.hash import Hash
 
 # Test configuration
 TEST_RPC_URL = "https://api.devnet.solana.com"
@@ -496,6 +1052,14 @@ class TestPerpetualsClient:
         # Test small values
         assert price_to_program(0.01) == 10_000_000
         assert abs(price_from_program(10_000_000) - 0.01) < 1e-9
+        
+        # Test vectorized conversions match the scalar ones
+        prices = [100.0, 100.50, 0.01, -2.5]
+        assert list(price_to_program_vec(np.array(prices))) == [price_to_program(p) for p in prices]
+        assert list(size_to_program_vec(np.array(prices))) == [size_to_program(p) for p in prices]
+        program_prices = [100_000_000_000, 10_000_000]
+        assert list(price_from_program_vec(np.array(program_prices))) == \
+            [price_from_program(p) for p in program_prices]
     
     @pytest.mark.asyncio
     async def test_pda_generation(self, client):
@@ -508,6 +1072,186 @@ class TestPerpetualsClient:
         assert bump1 == bump2
         assert isinstance(vault1, Pubkey)
         assert 0 <= bump1 <= 255
+        
+        # Cached PDAs must match a fresh derivation
+        user = Keypair().pubkey()
+        assert client.get_position_address(user) == Pubkey.find_program_address(
+            [b"position", bytes(user)], client.program_id
+        )
+        assert client.get_position_address(user) == client.get_position_address(user)
+        assert client.get_market_state_address() == Pubkey.find_program_address(
+            [b"market"], client.program_id
+        )
+        assert client.derive_pdas([(PDA_SEED,), (b"position", bytes(user)), (b"market",)]) == [
+            client.get_program_authority(),
+            client.get_position_address(user),
+            client.get_market_state_address(),
+        ]
+        # Non-pubkey position seeds take the generic derivation
+        assert client.derive_pdas([(b"position", b"short")]) == [
+            Pubkey.find_program_address([b"position", b"short"], client.program_id)
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_hedged_read(self):
+        """Test slow primary reads are hedged to a fallback endpoint"""
+        client = PerpetualsClient(
+            TEST_RPC_URL, Keypair(), TEST_PROGRAM_ID, fallback_rpc_urls=[TEST_RPC_URL]
+        )
+        
+        async def read(rpc_client):
+            if rpc_client is client.client:
+                await asyncio.sleep(10)  # Stalled primary
+                return "primary"
+            return "fallback"
+        
+        try:
+            assert await asyncio.wait_for(client._hedged_read(read), timeout=1) == "fallback"
+        finally:
+            await client.close()
+    
+    @pytest.mark.asyncio
+    async def test_market_state_cache(self, client):
+        """Test market state reads are shared and cached per commitment"""
+        fetches = []
+        
+        async def fetch_market_state(commitment):
+            fetches.append(commitment)
+            await asyncio.sleep(0.01)  # Let concurrent callers queue up
+            return MarketState(0, 0, 0, 254, len(fetches), 101_000_000_000)
+        
+        client._fetch_market_state = fetch_market_state
+        
+        # Concurrent callers share one fetch
+        states = await asyncio.gather(*(client.get_market_state(max_age=60) for _ in range(5)))
+        assert fetches == [Confirmed]
+        assert all(state is states[0] for state in states)
+        
+        # max_age=0 always fetches
+        assert await client.get_market_state(max_age=0) is not states[0]
+        assert fetches == [Confirmed, Confirmed]
+        
+        # A processed read is never served to a confirmed caller
+        processed = await client.get_market_state(max_age=60, commitment=Processed)
+        assert fetches[-1] == Processed
+        assert await client.get_market_state(max_age=60) is not processed
+        assert len(fetches) == 3
+    
+    @pytest.mark.asyncio
+    async def test_watch_liquidations(self, client, monkeypatch):
+        """Test pushed updates reach the right position when acks interleave"""
+        users = [Keypair().pubkey(), Keypair().pubkey()]
+        market_pda, _ = client.get_market_state_address()
+        position_pdas = [client.get_position_address(user)[0] for user in users]
+        mark_price = 100_000_000_000  # $100
+        market_data = _MARKET_STRUCT.pack(0, 0, 0, 254, 0, mark_price)
+        healthy = _POSITION_STRUCT.pack(bytes(users[1]), PRECISION, 200 * PRECISION, 0, mark_price)
+        underwater = _POSITION_STRUCT.pack(bytes(users[1]), PRECISION, 100 * PRECISION, 0, mark_price)
+        
+        def ack(request_id, subscription):
+            return SubscriptionResult.from_json(orjson.dumps(
+                {"jsonrpc": "2.0", "result": subscription, "id": request_id}
+            ).decode())
+        
+        def notification(subscription, data):
+            return AccountNotification.from_json(orjson.dumps({
+                "jsonrpc": "2.0",
+                "method": "accountNotification",
+                "params": {
+                    "result": {
+                        "context": {"slot": 1},
+                        "value": {
+                            "data": [base64.b64encode(data).decode(), "base64"],
+                            "executable": False,
+                            "lamports": 1_000_000,
+                            "owner": TEST_PROGRAM_ID,
+                            "rentEpoch": 0,
+                            "space": len(data),
+                        },
+                    },
+                    "subscription": subscription,
+                },
+            }).decode())
+        
+        class FakeWebsocket:
+            def __init__(self):
+                self.request_ids = iter(range(1, 100))
+                self.messages = []
+                self.subscribed = []
+            
+            def increment_counter_and_get_id(self):
+                return next(self.request_ids)
+            
+            async def send_data(self, requests):
+                self.subscribed = [(request.id, request.account) for request in requests]
+                ids = [request.id for request in requests]
+                # Acks out of order, with a notification for a live subscription in between
+                self.messages += [
+                    [ack(ids[2], 102)],
+                    [notification(102, underwater)],
+                    [ack(ids[0], 100), ack(ids[1], 101)],
+                    [notification(102, underwater)],
+                    [notification(100, b"")],  # Market account closed
+                ]
+            
+            async def recv(self):
+                return self.messages.pop(0)
+            
+            def __aiter__(self):
+                return self
+            
+            async def __anext__(self):
+                if not self.messages:
+                    raise StopAsyncIteration
+                return self.messages.pop(0)
+        
+        websocket = FakeWebsocket()
+        
+        @asynccontextmanager
+        async def fake_connect(url):
+            yield websocket
+        
+        async def get_accounts_bulk(addresses, commitment=Confirmed):
+            assert addresses == [market_pda, *position_pdas]
+            return [market_data, healthy, healthy]
+        
+        monkeypatch.setitem(globals(), "connect", fake_connect)
+        client.get_accounts_bulk = get_accounts_bulk
+        
+        results = [found async for found in PositionMonitor(client).watch_liquidations(users)]
+        
+        assert [address for _, address in websocket.subscribed] == [market_pda, *position_pdas]
+        assert results == [[], [users[1]]]
+    
+    @pytest.mark.asyncio
+    async def test_liquidate_many(self, client):
+        """Test batch liquidation results are matched back by id"""
+        targets = [(Keypair().pubkey(), Keypair().pubkey()) for _ in range(3)]
+        throttled = {"code": 429, "message": "Too many requests"}
+        replies = [
+            [
+                {"jsonrpc": "2.0", "id": 2, "result": "sig2"},
+                {"jsonrpc": "2.0", "id": 0, "error": throttled},
+                {"jsonrpc": "2.0", "id": 1, "result": "sig1"},
+                {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "Invalid request"}},
+                {"jsonrpc": "2.0", "id": 7, "result": "unknown"},
+            ],
+            {"jsonrpc": "2.0", "id": None, "error": throttled},
+        ]
+        
+        async def get_latest_blockhash():
+            return SimpleNamespace(value=SimpleNamespace(blockhash=Hash.default()))
+        
+        async def make_batch_request_unparsed(requests):
+            assert [request.id for request in requests] == [0, 1, 2]
+            return orjson.dumps(replies.pop(0)).decode()
+        
+        client.client.get_latest_blockhash = get_latest_blockhash
+        client.client._provider.make_batch_request_unparsed = make_batch_request_unparsed
+        
+        assert await client.liquidate_many(targets) == [(None, throttled), ("sig1", None), ("sig2", None)]
+        with pytest.raises(RuntimeError):
+            await client.liquidate_many(targets)
     
     def test_position_deserialization(self):
         """Test Position deserialization"""
@@ -563,10 +1307,51 @@ class TestPerpetualsClient:
         assert market_state.bump == bump
         assert market_state.last_funding_slot == last_funding_slot
         assert market_state.mark_price == mark_price
+    
+    @pytest.mark.asyncio
+    async def test_batch_calculations(self, client):
+        """Test batch health/PnL calculations match the per-position ones"""
+        mark_price = 101_000_000_000  # $101
+        owner = Keypair().pubkey()
+        positions = [
+            Position(owner, 1_000_000_000, 150_000_000_000, 0, 100_500_000_000),   # Long
+            Position(owner, -2_000_000_000, 100_000_000_000, 0, 102_000_000_000),  # Short
+            Position(owner, 0, 5_000_000_000, 0, 0),                               # Flat
+        ]
+        base_amount = np.array([p.base_amount for p in positions], dtype=np.int64)
+        collateral = np.array([p.collateral for p in positions], dtype=np.uint64)
+        entry_price = np.array([p.entry_price for p in positions], dtype=np.uint64)
+        
+        health = client.calculate_health_batch(base_amount, collateral, mark_price)
+        pnl = client.calculate_pnl_batch(base_amount, entry_price, mark_price)
+        
+        for i, position in enumerate(positions):
+            assert health[i] == client.calculate_position_health(position, mark_price)
+            assert pnl[i] == client.calculate_unrealized_pnl(position, mark_price)
+        
+        # 1000 units at $101 overflows a plain int64 product but not the result
+        large = Position(owner, 1000 * PRECISION, 0, 0, 150_000_000_000)
+        large_base = np.array([large.base_amount], dtype=np.int64)
+        large_entry = np.array([large.entry_price], dtype=np.uint64)
+        assert client.calculate_pnl_batch(large_base, large_entry, mark_price)[0] == \
+            client.calculate_unrealized_pnl(large, mark_price)
+        
+        # Liquidation scan agrees with the health ratio threshold
+        assert list(scan_liquidatable(base_amount, collateral, mark_price)) == \
+            [h < 1.5 for h in health]
 
 # Run demo if this file is executed directly
 if __name__ == "__main__":
     print("🐍 Creating Solana Perpetuals Python Client")
     if not program_id_loaded:
         print("⚠️  Make sure to replace PROGRAM_ID_STR and token accounts with actual values!")
-    asyncio.run(example_usage())
\ No newline at end of file
+    
+    try:
+        import uvloop  # Optional faster event loop (Linux/macOS)
+    except ImportError:
+        uvloop = None
+    
+    if uvloop is not None:
+        uvloop.run(example_usage())
+    else:
+        asyncio.run(example_usage())
\ No newline at end of file